@@ -1,6 +1,238 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
 import pymortar
 import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _outlier_counts_py(v, sum_mask, win_mask, sl, su, wl, wu):
+    """Count the occupied and out-of-range samples in one pass over the values."""
+    n_occ = 0
+    n_out = 0
+    for i in range(v.shape[0]):
+        if sum_mask[i]:
+            n_occ += 1
+            if v[i] < sl or v[i] > su:
+                n_out += 1
+        elif win_mask[i]:
+            n_occ += 1
+            if v[i] < wl or v[i] > wu:
+                n_out += 1
+    return n_occ, n_out
+
+
+def _degree_sum_py(v, sum_mask, win_mask, sl, su, wl, wu):
+    """Sum the out-of-range magnitudes over both seasons in one pass."""
+    total = 0.0
+    for i in range(v.shape[0]):
+        if sum_mask[i]:
+            if v[i] < sl:
+                total += sl - v[i]
+            elif v[i] > su:
+                total += v[i] - su
+        elif win_mask[i]:
+            if v[i] < wl:
+                total += wl - v[i]
+            elif v[i] > wu:
+                total += v[i] - wu
+    return total
+
+
+if njit is not None:
+    # compile the hot reduce kernels when numba is available, e.g. for
+    # sweeps over many sensors where the python-level loop would dominate
+    _outlier_counts = njit(cache=True)(_outlier_counts_py)
+    _degree_sum = njit(cache=True)(_degree_sum_py)
+else:
+    def _outlier_counts(v, sum_mask, win_mask, sl, su, wl, wu):
+        n_occ = np.count_nonzero(sum_mask) + np.count_nonzero(win_mask)
+        n_out = (np.count_nonzero(sum_mask & ((v < sl) | (v > su))) +
+                 np.count_nonzero(win_mask & ((v < wl) | (v > wu))))
+        return n_occ, n_out
+
+    def _degree_sum(v, sum_mask, win_mask, sl, su, wl, wu):
+        # accumulate in float64 so float32 storage does not degrade the total
+        sum_diff = ((np.maximum(sl - v, 0) + np.maximum(v - su, 0)) * sum_mask).sum(dtype=np.float64)
+        win_diff = ((np.maximum(wl - v, 0) + np.maximum(v - wu, 0)) * win_mask).sum(dtype=np.float64)
+        return sum_diff + win_diff
+
+
+@lru_cache(maxsize=1)
+def _get_client():
+    """Connect a client to the Mortar frontend server, reusing one connection."""
+    return pymortar.Client("https://beta-api.mortardata.org")
+
+
+@lru_cache(maxsize=128)
+def _fetch(md):
+    """
+    Download the full timeseries of one sensor and cache it.
+
+    Parameters
+    ----------
+    md : str
+         sensor metadata with prefix of http://buildsys.org/ontologies
+
+    Returns
+    ----------
+    data : pandas.DataFrame
+           dataframe of sensor values indexed by a sorted DatetimeIndex
+    """
+    # use the frame primed by prefetch when available, otherwise download it
+    raw = _prefetched.pop(md, None)
+    if raw is None:
+        client = _get_client()
+        raw = client.data_uris([md]).data
+    # assemble the prepared frame directly instead of mutating a copy of
+    # the fetched one, so no chained-assignment bookkeeping is involved.
+    # the timestamps are parsed once; float32 keeps plenty of precision
+    # for F temperatures and halves the memory traffic of downstream
+    # reductions; the object-dtype uri strings are left behind entirely
+    ts = pd.DatetimeIndex(pd.to_datetime(raw['time'], utc=True), name='time')
+    df = pd.DataFrame({'value': raw['value'].to_numpy(dtype='float32')}, index=ts)
+    return df.sort_index()
+
+
+# frames downloaded in bulk by prefetch, consumed by _fetch one at a time
+_prefetched = {}
+
+
+def prefetch(mds):
+    """
+    Download several sensors in one round-trip and prime the fetch cache.
+
+    Parameters
+    ----------
+    mds : list of str
+          sensor metadata with prefix of http://buildsys.org/ontologies
+    """
+    client = _get_client()
+    data = client.data_uris(list(mds)).data
+    # split the combined frame on the sensor uri column
+    uri_col = 'uri' if 'uri' in data.columns else 'id'
+    for md, group in data.groupby(uri_col):
+        _prefetched[md] = group.drop(columns=[uri_col])
+    # move each primed frame into _fetch's lru cache
+    for md in mds:
+        _fetch(md)
+
+
+def _prepare(md, sd, ed, sh, eh):
+    """
+    Fetch one sensor, slice the evaluation window and build the occupied mask.
+
+    Parameters
+    ----------
+    md : str
+         sensor metadata with prefix of http://buildsys.org/ontologies
+    sd : str
+         start date with format year-month-day, e.g.'2016-1-1'
+    ed : str
+         end date with format year-month-day, e.g.'2016-1-31'
+    sh : int
+         start hour of normal occupied time with 24-hour clock, e.g. 9
+    eh : int
+         end hour of normal occupied time with 24-hour clock, e.g. 17
+
+    Returns
+    ----------
+    df : pandas.DataFrame
+         sensor values between start and end date, indexed by time
+    occ : numpy.ndarray
+         boolean mask of the normal occupied samples
+    """
+    assert isinstance(sd, str), 'The start date should be in a string.'
+    assert isinstance(ed, str), 'The end date should be in a string.'
+    assert sh < eh, "The start and end hour should be 24-hour clock."
+    # fetch the sensor data, cached across calls on the same sensor
+    data = _fetch(md)
+    # slice between start date and end date by binary search on the sorted index
+    df = data.loc[pd.to_datetime(sd, utc=True):pd.to_datetime(ed, utc=True)]
+    return df, _occupied_mask(df.index, sh, eh)
+
+
+def _occupied_mask(idx, sh, eh):
+    """
+    Build the occupied mask by binary-searching window boundaries.
+
+    Instead of testing the hour and weekday of every sample, one
+    occupied interval per business day is searchsorted into the sorted
+    int64 timestamps and the covered ranges are marked with a cumsum of
+    boundary steps — a few hundred binary searches rather than three
+    full passes over the samples.
+    """
+    n = len(idx)
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+    # one occupied window per business day spanned by the index
+    days = pd.date_range(idx[0].normalize(), idx[-1].normalize(), freq='B')
+    t = idx.as_unit('ns').astype('int64')
+    starts = (days + pd.Timedelta(hours=sh)).as_unit('ns').astype('int64')
+    ends = (days + pd.Timedelta(hours=eh)).as_unit('ns').astype('int64')
+    # sh is inclusive and eh exclusive, matching hr >= sh and hr < eh
+    lo = np.searchsorted(t, starts, side='left')
+    hi = np.searchsorted(t, ends, side='left')
+    steps = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(steps, lo, 1)
+    np.add.at(steps, hi, -1)
+    return np.cumsum(steps[:-1]) > 0
+
+
+def _summer_mask(idx, ss, ws):
+    """
+    Mark the samples whose month lies in [ss, ws), one slice per year.
+
+    The summer of each year covered by the index is a contiguous run on
+    the sorted timestamps, so both of its endpoints are found by binary
+    search instead of comparing every sample's month.
+    """
+    n = len(idx)
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+    t = idx.as_unit('ns').astype('int64')
+    for y in range(idx[0].year, idx[-1].year + 1):
+        bounds = pd.DatetimeIndex([pd.Timestamp(year=y, month=ss, day=1, tz=idx.tz),
+                                   pd.Timestamp(year=y, month=ws, day=1, tz=idx.tz)])
+        lo, hi = np.searchsorted(t, bounds.as_unit('ns').astype('int64'))
+        mask[lo:hi] = True
+    return mask
+
+
+def _ratio(num, den):
+    """
+    Divide num by den, yielding 0.0 when the denominator is zero.
+
+    np.divide with a where guard leaves the zero-initialized output
+    untouched instead of branching at the Python level, which keeps the
+    expression usable inside vectorized batch paths.
+    """
+    return float(np.divide(num, den, out=np.zeros(()), where=(den != 0)))
+
+
+def _season_masks(occ, in_sum):
+    """
+    Split the occupied mask into summer and winter masks.
+
+    When the evaluation window falls entirely within one season, the
+    other side is a cheap zero-filled mask instead of two more vector
+    passes; .all()/.any() bail out early on the first counterexample.
+    """
+    if in_sum.all():
+        return occ, np.zeros_like(occ)
+    if not in_sum.any():
+        return np.zeros_like(occ), occ
+    return occ & in_sum, occ & ~in_sum
+
+
+@lru_cache(maxsize=128)
 def range_outlier(md, ss, ws, sd, ed, sh, eh, sl, su, wl, wu):
     """
     Calculate the percentage of normal occupied time outside a specified temeprature range.
@@ -36,39 +268,19 @@ def range_outlier(md, ss, ws, sd, ed, sh, eh, sl, su, wl, wu):
     p : float
         percentage of outside range time
     """
-    assert isinstance(sd, str), 'The start date should be in a string.'
-    assert isinstance(ed, str), 'The end date should be in a string.'
-    assert sh < eh, "The start and end hour should be 24-hour clock."
-    # connect client to Mortar frontend server
-    client = pymortar.Client("https://beta-api.mortardata.org")
-    data_sensor = client.data_uris([md])
-    data = data_sensor.data
-    # get a pandas dataframe between start date and end date of the data
-    sd_ns = pd.to_datetime(sd, unit='ns', utc=True)
-    ed_ns = pd.to_datetime(ed, unit='ns', utc=True)
-    df = data[(data['time'] >= sd_ns) & (data['time'] <= ed_ns)]
-    # parse the hour and weekday info and add it as a column
-    df['hr'] = pd.to_datetime(df['time']).dt.hour
-    df['wk'] = pd.to_datetime(df['time']).dt.dayofweek
-    df['mo'] = pd.to_datetime(df['time']).dt.month
-    # create occupied df by normal office hours and by weekdays
-    df_occ = df[(df['hr'] >= sh) & (df['hr'] < eh) &
-                (df['wk'] >= 0) & (df['wk'] <= 4)]
-    # split the occupied data to the summer and  winter
-    df_occ_sum = df_occ[(df_occ['mo'] >= ss) & (df_occ['mo'] <= (ws-1))]
-    df_occ_win = df_occ[(df_occ['mo'] >= ws) | (df_occ['mo'] <= (ss-1))]
-    # create df that is lower or upper the temperature range
-    df_sum_out = df_occ_sum[(df_occ_sum['value'] < sl) | 
-                            (df_occ_sum['value'] > su)]
-    df_win_out = df_occ_win[(df_occ_win['value'] < wl) |
-                           (df_occ_win['value'] > wu)]
-    # the number of summer and winter occupied time
-    n_occ_all = len(df_occ_sum) + len(df_occ_win)
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    v = df['value'].to_numpy()
+    # locate the summer runs by binary search instead of per-sample months
+    in_sum = _summer_mask(df.index, ss, ws)
+    sum_mask, win_mask = _season_masks(occ, in_sum)
+    # count occupied and out-of-range samples in a single fused reduction
+    n_occ_all, n_out = _outlier_counts(v, sum_mask, win_mask, sl, su, wl, wu)
     # Calculate the percentage of occupied time outside the temeprature range
-    p = (len(df_sum_out) + len(df_win_out)) / n_occ_all if n_occ_all != 0 else 0
+    p = _ratio(n_out, n_occ_all)
     return round(p, 2)
 
 
+@lru_cache(maxsize=128)
 def daily_range_outlier(md, sd, ed, sh, eh, th):
     """
     Calculate the percentage of occupied days when temp range is outside the threshold.
@@ -94,32 +306,17 @@ def daily_range_outlier(md, sd, ed, sh, eh, th):
     p : float
         percentage of the time
     """
-    assert isinstance(sd, str), 'The start date should be in a string.'
-    assert isinstance(ed, str), 'The end date should be in a string.'
-    assert sh < eh, "The start and end hour should be 24-hour clock."
-    # connect client to Mortar frontend server
-    client = pymortar.Client("https://beta-api.mortardata.org")
-    data_sensor = client.data_uris([md])
-    data = data_sensor.data
-    # get a pandas dataframe between start date and end date of the data
-    sd_ns = pd.to_datetime(sd, unit='ns', utc=True)
-    ed_ns = pd.to_datetime(ed, unit='ns', utc=True)
-    df = data[(data['time'] >= sd_ns) & (data['time'] <= ed_ns)]
-    # parse the hour and weekday info and add it as a column
-    df['hr'] = pd.to_datetime(df['time']).dt.hour
-    df['wk'] = pd.to_datetime(df['time']).dt.dayofweek
-    df['da'] = pd.to_datetime(df['time']).dt.date
-    # create occupied df by normal office hours and by weekdays
-    df_occ = df[(df['hr'] >= sh) & (df['hr'] < eh) &
-                (df['wk'] >= 0) & (df['wk'] <= 4)]
-    # calculate occupied daily temperature range by max minus min
-    df_occ_max = df_occ.groupby(['da']).max()
-    df_occ_min = df_occ.groupby(['da']).min()
-    # add a new column to the df_max called range
-    df_occ_max['range'] = df_occ_max['value'] - df_occ_min['value']
-    # create a new df containing rows that are out of the threshold
-    df_out = df_occ_max[(df_occ_max['range'] > th)]
-    p = len(df_out) / len(df_occ) if len(df_occ) != 0 else 0
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    n_occ = np.count_nonzero(occ)
+    df_occ = df[occ]
+    # bucket by day with integer division on the ns timestamps, avoiding
+    # the object-dtype date keys that .date would materialize
+    day = df_occ.index.as_unit('ns').astype('int64') // 86_400_000_000_000
+    # calculate occupied daily temperature range by max minus min in one grouped pass
+    daily = df_occ.groupby(day)['value'].agg(['min', 'max'])
+    daily_range = daily['max'] - daily['min']
+    # count the days whose range is out of the threshold
+    p = _ratio(np.count_nonzero(daily_range.to_numpy() > th), n_occ)
     return round(p, 2)
 
 def combined_outlier(ro, dr):
@@ -141,6 +338,7 @@ def combined_outlier(ro, dr):
     p = (ro + dr)/2
     return round(p, 2)
 
+@lru_cache(maxsize=128)
 def degree_hours(md, ss, ws, sd, ed, sh, eh, sl, su, wl, wu):
     """
     Calculate the product sum of weighted factors and exposure time time.
@@ -175,42 +373,19 @@ def degree_hours(md, ss, ws, sd, ed, sh, eh, sl, su, wl, wu):
     ps : float
          degree hours
     """
-    assert isinstance(sd, str), 'The start date should be in a string.'
-    assert isinstance(ed, str), 'The end date should be in a string.'
-    assert sh < eh, "The start and end hour should be 24-hour clock."
-    # connect client to Mortar frontend server
-    client = pymortar.Client("https://beta-api.mortardata.org")
-    data_sensor = client.data_uris([md])
-    data = data_sensor.data
-    # get a pandas dataframe between start date and end date of the data
-    sd_ns = pd.to_datetime(sd, unit='ns', utc=True)
-    ed_ns = pd.to_datetime(ed, unit='ns', utc=True)
-    df = data[(data['time'] >= sd_ns) & (data['time'] <= ed_ns)]
-    # parse the hour and weekday info and add it as a column
-    df['hr'] = pd.to_datetime(df['time']).dt.hour
-    df['wk'] = pd.to_datetime(df['time']).dt.dayofweek
-    df['mo'] = pd.to_datetime(df['time']).dt.month
-    # create occupied df by normal office hours and by weekdays
-    df_occ = df[(df['hr'] >= sh) & (df['hr'] < eh) &
-                (df['wk'] >= 0) & (df['wk'] <= 4)]
-    # split the occupied data to the summer and  winter
-    df_occ_sum = df_occ[(df_occ['mo'] >= ss) & (df_occ['mo'] <= (ws-1))]
-    df_occ_win = df_occ[(df_occ['mo'] >= ws) | (df_occ['mo'] <= (ss-1))]
-    # overheating and overcooling rows in summer and winter
-    df_sum_oc = df_occ_sum[(df_occ_sum['value'] < sl)]
-    df_sum_oh = df_occ_sum[(df_occ_sum['value'] > su)]
-    df_win_oc = df_occ_win[(df_occ_win['value'] < wl)]
-    df_win_oh = df_occ_win[(df_occ_win['value'] > wu)]
-    # magnitude of overheating and overcooling in summer and winter
-    sum_oc_diff = (sl - df_sum_oc['value']).sum()
-    sum_oh_diff = (df_sum_oh['value'] - su).sum()
-    win_oc_diff = (wl - df_win_oc['value']).sum()
-    win_oh_diff = (df_win_oh['value'] - wu).sum()
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    v = df['value'].to_numpy()
+    # locate the summer runs by binary search instead of per-sample months
+    in_sum = _summer_mask(df.index, ss, ws)
+    sum_mask, win_mask = _season_masks(occ, in_sum)
+    # out-of-range magnitudes over both seasons in a single fused reduction
+    diff = _degree_sum(v, sum_mask, win_mask, sl, su, wl, wu)
     # sum and then multiple one hour
-    ps = (sum_oc_diff + sum_oh_diff + win_oc_diff + win_oh_diff) * (15/60)
+    ps = diff * (15/60)
     return round(ps, 2)
 
 
+@lru_cache(maxsize=128)
 def temp_mean(md, sd, ed, sh, eh):
     """
     Calculate mean value of the temperature at occupied time.
@@ -233,27 +408,12 @@ def temp_mean(md, sd, ed, sh, eh):
     m : float
         mean value of the tempearture
     """
-    assert isinstance(sd, str), 'The start date should be in a string.'
-    assert isinstance(ed, str), 'The end date should be in a string.'
-    assert sh < eh, "The start and end hour should be 24-hour clock."
-    # connect client to Mortar frontend server
-    client = pymortar.Client("https://beta-api.mortardata.org")
-    data_sensor = client.data_uris([md])
-    data = data_sensor.data
-    # get a pandas dataframe between start date and end date of the data
-    sd_ns = pd.to_datetime(sd, unit='ns', utc=True)
-    ed_ns = pd.to_datetime(ed, unit='ns', utc=True)
-    df = data[(data['time'] >= sd_ns) & (data['time'] <= ed_ns)]
-    # parse the hour and weekday info and add it as a column
-    df['hr'] = pd.to_datetime(df['time']).dt.hour
-    df['wk'] = pd.to_datetime(df['time']).dt.dayofweek
-    # create occupied df by normal office hours and by weekdays
-    df_occ = df[(df['hr'] >= sh) & (df['hr'] < eh) &
-                (df['wk'] >= 0) & (df['wk'] <= 4)]
-    # Calculate mean value of the temperature from the new datafram
-    m = df_occ['value'].mean()
-    return round(m, 2)
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    # Calculate mean value of the temperature over the occupied samples
+    m = df['value'].to_numpy()[occ].mean(dtype=np.float64)
+    return round(float(m), 2)
 
+@lru_cache(maxsize=128)
 def temp_var(md, sd, ed, sh, eh):
     """
     Calculate variance of occupied hourly average temperature data.
@@ -278,30 +438,14 @@ def temp_var(md, sd, ed, sh, eh):
     """
     
     
-    assert isinstance(sd, str), 'The start date should be in a string.'
-    assert isinstance(ed, str), 'The end date should be in a string.'
-    assert sh < eh, "The start and end hour should be 24-hour clock."
-    # connect client to Mortar frontend server
-    client = pymortar.Client("https://beta-api.mortardata.org")
-    data_sensor = client.data_uris([md])
-    data = data_sensor.data
-    # get a pandas dataframe between start date and end date of the data
-    sd_ns = pd.to_datetime(sd, unit='ns', utc=True)
-    ed_ns = pd.to_datetime(ed, unit='ns', utc=True)
-    df = data[(data['time'] >= sd_ns) & (data['time'] <= ed_ns)]
-    # parse the hour and weekday info and add it as a column
-    df['hr'] = pd.to_datetime(df['time']).dt.hour
-    df['wk'] = pd.to_datetime(df['time']).dt.dayofweek
-    df['da'] = pd.to_datetime(df['time']).dt.date
-    # create occupied df by normal office hours and by weekdays
-    df_occ = df[(df['hr'] >= sh) & (df['hr'] < eh) &
-                (df['wk'] >= 0) & (df['wk'] <= 4)]
-    # get hourly average data by grouping by date frist and hour, then mean
-    df_hrs = df_occ.groupby(['da', 'hr']).mean()
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    # get hourly average data by resampling the occupied samples
+    hourly = df['value'][occ].resample('h').mean().dropna()
     # calculate variance of occupied hourly average temperature data.
-    v = df_hrs['value'].var()
-    return round(v, 2)
+    v = hourly.astype('float64').var()
+    return round(float(v), 2)
 
+@lru_cache(maxsize=128)
 def overcooling_outlier(md, ss, ws, sd, ed, sh, eh, sl, wl):
     """
     Calculate the percentage of normal occupied time lower than a specified temeprature range.
@@ -333,36 +477,18 @@ def overcooling_outlier(md, ss, ws, sd, ed, sh, eh, sl, wl):
     p : float
         percentage of outside range time
     """
-    assert isinstance(sd, str), 'The start date should be in a string.'
-    assert isinstance(ed, str), 'The end date should be in a string.'
-    assert sh < eh, "The start and end hour should be 24-hour clock."
-    # connect client to Mortar frontend server
-    client = pymortar.Client("https://beta-api.mortardata.org")
-    data_sensor = client.data_uris([md])
-    data = data_sensor.data
-    # get a pandas dataframe between start date and end date of the data
-    sd_ns = pd.to_datetime(sd, unit='ns', utc=True)
-    ed_ns = pd.to_datetime(ed, unit='ns', utc=True)
-    df = data[(data['time'] >= sd_ns) & (data['time'] <= ed_ns)]
-    # parse the hour and weekday info and add it as a column
-    df['hr'] = pd.to_datetime(df['time']).dt.hour
-    df['wk'] = pd.to_datetime(df['time']).dt.dayofweek
-    df['mo'] = pd.to_datetime(df['time']).dt.month
-    # create occupied df by normal office hours and by weekdays
-    df_occ = df[(df['hr'] >= sh) & (df['hr'] < eh) &
-                (df['wk'] >= 0) & (df['wk'] <= 4)]
-    # split the occupied data to the summer and  winter
-    df_occ_sum = df_occ[(df_occ['mo'] >= ss) & (df_occ['mo'] <= (ws-1))]
-    df_occ_win = df_occ[(df_occ['mo'] >= ws) | (df_occ['mo'] <= (ss-1))]
-    # create df that is lower or upper the temperature range
-    df_sum_out = df_occ_sum[(df_occ_sum['value'] < sl)]
-    df_win_out = df_occ_win[(df_occ_win['value'] < wl)]
-    # the number of summer and winter occupied time
-    n_occ_all = len(df_occ_sum) + len(df_occ_win)
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    v = df['value'].to_numpy()
+    # locate the summer runs by binary search instead of per-sample months
+    in_sum = _summer_mask(df.index, ss, ws)
+    sum_mask, win_mask = _season_masks(occ, in_sum)
+    # only the lower bounds apply, so disable the upper ones
+    n_occ_all, n_out = _outlier_counts(v, sum_mask, win_mask, sl, np.inf, wl, np.inf)
     # Calculate the percentage of occupied time outside the temeprature range
-    p = (len(df_sum_out) + len(df_win_out)) / n_occ_all if n_occ_all != 0 else 0
+    p = _ratio(n_out, n_occ_all)
     return round(p, 2)
 
+@lru_cache(maxsize=128)
 def overheating_outlier(md, ss, ws, sd, ed, sh, eh, su, wu):
     """
     Calculate the percentage of normal occupied time higher than a specified temeprature range.
@@ -394,32 +520,98 @@ def overheating_outlier(md, ss, ws, sd, ed, sh, eh, su, wu):
     p : float
         percentage of outside range time
     """
-    assert isinstance(sd, str), 'The start date should be in a string.'
-    assert isinstance(ed, str), 'The end date should be in a string.'
-    assert sh < eh, "The start and end hour should be 24-hour clock."
-    # connect client to Mortar frontend server
-    client = pymortar.Client("https://beta-api.mortardata.org")
-    data_sensor = client.data_uris([md])
-    data = data_sensor.data
-    # get a pandas dataframe between start date and end date of the data
-    sd_ns = pd.to_datetime(sd, unit='ns', utc=True)
-    ed_ns = pd.to_datetime(ed, unit='ns', utc=True)
-    df = data[(data['time'] >= sd_ns) & (data['time'] <= ed_ns)]
-    # parse the hour and weekday info and add it as a column
-    df['hr'] = pd.to_datetime(df['time']).dt.hour
-    df['wk'] = pd.to_datetime(df['time']).dt.dayofweek
-    df['mo'] = pd.to_datetime(df['time']).dt.month
-    # create occupied df by normal office hours and by weekdays
-    df_occ = df[(df['hr'] >= sh) & (df['hr'] < eh) &
-                (df['wk'] >= 0) & (df['wk'] <= 4)]
-    # split the occupied data to the summer and winter
-    df_occ_sum = df_occ[(df_occ['mo'] >= ss) & (df_occ['mo'] <= (ws-1))]
-    df_occ_win = df_occ[(df_occ['mo'] >= ws) | (df_occ['mo'] <= (ss-1))]
-    # create df that is higher than the upper bound of the temperature range
-    df_sum_out = df_occ_sum[(df_occ_sum['value'] > su)]
-    df_win_out = df_occ_win[(df_occ_win['value'] > wu)]
-    # the number of summer and winter occupied time
-    n_occ_all = len(df_occ_sum) + len(df_occ_win)
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    v = df['value'].to_numpy()
+    # locate the summer runs by binary search instead of per-sample months
+    in_sum = _summer_mask(df.index, ss, ws)
+    sum_mask, win_mask = _season_masks(occ, in_sum)
+    # only the upper bounds apply, so disable the lower ones
+    n_occ_all, n_out = _outlier_counts(v, sum_mask, win_mask, -np.inf, su, -np.inf, wu)
     # Calculate the percentage of occupied time outside the temeprature range
-    p = (len(df_sum_out) + len(df_win_out)) / n_occ_all if n_occ_all != 0 else 0
-    return round(p, 2)
\ No newline at end of file
+    p = _ratio(n_out, n_occ_all)
+    return round(p, 2)
+
+
+@dataclass(frozen=True)
+class ComfortIndices:
+    """All air temperature based indices for one sensor and one window."""
+    range_outlier: float
+    daily_range_outlier: float
+    combined_outlier: float
+    degree_hours: float
+    temp_mean: float
+    temp_var: float
+    overcooling_outlier: float
+    overheating_outlier: float
+
+
+@lru_cache(maxsize=128)
+def all_indices(md, ss, ws, sd, ed, sh, eh, sl, su, wl, wu, th):
+    """
+    Calculate all the indices for one sensor from a single prepared pass.
+
+    Calling the individual index functions re-derives the date slice and
+    the occupied/season masks for each of them; this entry point shares
+    that work once across all eight results.
+
+    Parameters
+    ----------
+    md : str
+         sensor metadata with prefix of http://buildsys.org/ontologies
+    ss : int
+         summer start month, e.g. 5
+    ws : int
+         summer start month, e.g. 11
+    sd : str
+         start date with format year-month-day, e.g.'2016-1-1'
+    ed : str
+         end date with format year-month-day, e.g.'2016-1-31'
+    sh : int
+         start hour of normal occupied time with 24-hour clock, e.g. 9
+    eh : int
+         end hour of normal occupied time with 24-hour clock, e.g. 17
+    sl : float
+         lower bound of the tempearture range in summer, with default F unit
+    su : float
+         upper bound of the temperature range in summer, with default F unit
+    wl : float
+         lower bound of the tempearture range in winter, with default F unit
+    wu : float
+         upper bound of the temperature range in winter, with default F unit
+    th : float
+         threshold of daily temperature range, with default F unit
+
+    Returns
+    ----------
+    indices : ComfortIndices
+              all index values for the sensor and window
+    """
+    df, occ = _prepare(md, sd, ed, sh, eh)
+    v = df['value'].to_numpy()
+    # the masks are built once and shared by every seasonal reduction
+    in_sum = _summer_mask(df.index, ss, ws)
+    sum_mask, win_mask = _season_masks(occ, in_sum)
+    n_occ_all, n_out = _outlier_counts(v, sum_mask, win_mask, sl, su, wl, wu)
+    _, n_oc = _outlier_counts(v, sum_mask, win_mask, sl, np.inf, wl, np.inf)
+    _, n_oh = _outlier_counts(v, sum_mask, win_mask, -np.inf, su, -np.inf, wu)
+    ro = round(_ratio(n_out, n_occ_all), 2)
+    oc = round(_ratio(n_oc, n_occ_all), 2)
+    oh = round(_ratio(n_oh, n_occ_all), 2)
+    # the daily range and hourly variance reuse the occupied slice
+    n_occ = np.count_nonzero(occ)
+    df_occ = df[occ]
+    day = df_occ.index.as_unit('ns').astype('int64') // 86_400_000_000_000
+    daily = df_occ.groupby(day)['value'].agg(['min', 'max'])
+    daily_range = daily['max'] - daily['min']
+    dr = round(_ratio(np.count_nonzero(daily_range.to_numpy() > th), n_occ), 2)
+    hourly = df_occ['value'].resample('h').mean().dropna()
+    return ComfortIndices(
+        range_outlier=ro,
+        daily_range_outlier=dr,
+        combined_outlier=round((ro + dr) / 2, 2),
+        degree_hours=round(_degree_sum(v, sum_mask, win_mask, sl, su, wl, wu) * (15/60), 2),
+        temp_mean=round(float(v[occ].mean(dtype=np.float64)), 2),
+        temp_var=round(float(hourly.astype('float64').var()), 2),
+        overcooling_outlier=oc,
+        overheating_outlier=oh,
+    )
\ No newline at end of file